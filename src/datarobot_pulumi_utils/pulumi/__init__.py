@@ -12,13 +12,28 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from typing import TYPE_CHECKING, Any
+
+from . import export_collector as _export_collector
 from .execution_environment import resolve_execution_environment_version
-from .export_collector import ExportCollector, default_collector, export, finalize
+from .export_collector import ExportCollector, IncrementalExportCollector, export, finalize
 
 __all__ = [
     "default_collector",
     "ExportCollector",
+    "IncrementalExportCollector",
     "export",
     "finalize",
     "resolve_execution_environment_version",
 ]
+
+
+if TYPE_CHECKING:
+    from .export_collector import default_collector
+else:
+
+    def __getattr__(name: str) -> Any:
+        # default_collector is created lazily, on first access
+        if name == "default_collector":
+            return _export_collector.default_collector
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
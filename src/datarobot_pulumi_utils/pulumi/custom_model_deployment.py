@@ -80,7 +80,7 @@ class CustomModelDeployment(pulumi.ComponentResource):
         self.deployment = drp.Deployment(
             prediction_environment_id=prediction_environment.id,
             registered_model_version_id=self.registered_model.version_id,
-            **deployment_args.model_dump(),
+            **deployment_args.model_dump(exclude_none=True),
             opts=pulumi.ResourceOptions(parent=self),
             use_case_ids=use_case_ids,
         )
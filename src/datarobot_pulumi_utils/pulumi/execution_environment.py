@@ -11,14 +11,21 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import functools
 import os
-import re
 from typing import Optional
 
 import datarobot as dr
 import pulumi
 from datarobot.enums import EXECUTION_ENVIRONMENT_VERSION_BUILD_STATUS
 
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+
+def _is_object_id(value: str) -> bool:
+    """Whether value is a 24-char lowercase hex ObjectId; a length + set check, no regex engine."""
+    return len(value) == 24 and _HEX_DIGITS.issuperset(value)
+
 
 def resolve_execution_environment_version(
     execution_environment_id: str,
@@ -29,15 +36,27 @@ def resolve_execution_environment_version(
     Reads and validates the pinned version from the given env var.
     If the version is not found (e.g. on-prem environment lacks it), logs a warning
     and returns None so the caller uses latest.
+
+    Results are cached per (environment, env var, env var value), so resolving the same pinned
+    version for many custom models only hits the DataRobot API once.
     """
-    requested_version_id = os.environ.get(version_env_var, None)
-    if requested_version_id:
-        requested_version_id = requested_version_id.strip("'\"")
-    if not re.match(r"^[a-f0-9]{24}$", str(requested_version_id or "")):
+    return _resolve_execution_environment_version(
+        execution_environment_id, version_env_var, os.environ.get(version_env_var, "")
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_execution_environment_version(
+    execution_environment_id: str,
+    version_env_var: str,
+    env_value: str,
+) -> Optional[str]:
+    requested_version_id = env_value.strip().strip("'\"").strip()
+    if not _is_object_id(requested_version_id):
         pulumi.info("No valid execution environment version ID provided, using latest version.")
         return None
     try:
-        version = dr.ExecutionEnvironmentVersion.get(execution_environment_id, str(requested_version_id))
+        version = dr.ExecutionEnvironmentVersion.get(execution_environment_id, requested_version_id)
         if version.build_status == EXECUTION_ENVIRONMENT_VERSION_BUILD_STATUS.SUCCESS:
             return version.id
         pulumi.warn(
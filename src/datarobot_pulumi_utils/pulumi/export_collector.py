@@ -12,19 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """
-Public interface for pulumi-exporter.
+Collects Pulumi stack exports and writes them to a JSON file.
 
 Typical use:
 
-    from pulumi_exporter import export, finalize
+    from datarobot_pulumi_utils.pulumi import export, finalize
 
     bucket = aws.s3.Bucket("b")
     export("bucket_name", bucket.id)
-    finalize()  # writes pulumi_exports.json by default (after resolution)
+    finalize()  # writes ../pulumi_config.json by default (after resolution)
 
 Or with a custom path & redactor:
 
-    from pulumi_exporter import ExportCollector
+    from datarobot_pulumi_utils.pulumi import ExportCollector
 
     collector = ExportCollector(output_path="build/stack_outputs.json",
                                 redactor=lambda k,v: "***" if "secret" in k else v)
@@ -32,46 +32,95 @@ Or with a custom path & redactor:
     # define resources ...
     collector.finalize()
 
-To patch existing code using pulumi.export:
-
-    from pulumi_exporter import patch_pulumi_export
-    patch_pulumi_export()
-    # existing pulumi.export(...) calls are now captured
-    finalize()
+To also get snapshots of the already resolved values while the others are still resolving,
+use IncrementalExportCollector instead.
 """
 
 __all__ = [
     "ExportCollector",
+    "IncrementalExportCollector",
     "default_collector",
     "export",
     "finalize",
 ]
 
 
+import atexit
 import json
+import math
 import os
 import tempfile
+from enum import Enum
 from pathlib import Path
-from threading import Lock
-from typing import Any, Callable, Dict, Optional
+from threading import Lock, Timer
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
 
 import pulumi
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup, see the "orjson" extra
+    orjson = None  # type: ignore[assignment]
+
 Redactor = Callable[[str, Any], Any]
 
+# Set to "0" to skip fsync-ing export files, e.g. in CI where they are regenerated on every run
+_DURABLE_ENV_VAR = "DATAROBOT_PULUMI_EXPORTER_DURABLE"
+
+
+def _needs_stdlib(value: Any) -> bool:
+    """Whether orjson would encode `value` differently from the stdlib encoder."""
+    if isinstance(value, float):
+        # orjson writes NaN and infinities as null
+        return not math.isfinite(value)
+    if isinstance(value, Enum):
+        # orjson writes the member's value, the stdlib encoder goes through default=str
+        return not isinstance(value, (int, str))
+    if isinstance(value, dict):
+        return any(_needs_stdlib(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_needs_stdlib(v) for v in value)
+    return False
+
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    """
+    Serialize exports to indented JSON, using orjson's C encoder when it is installed.
+
+    The output is the same whichever encoder is used: two-space indentation, non-ASCII text written
+    as UTF-8, and unsupported types written with str(). Values orjson would encode differently
+    (NaN, plain enums) or can't encode at all (e.g. ints above 64 bits) go through the stdlib encoder.
+    """
+    if orjson is not None and not _needs_stdlib(data):
+        try:
+            return orjson.dumps(
+                data,
+                default=str,
+                option=orjson.OPT_INDENT_2
+                | orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_PASSTHROUGH_DATACLASS
+                | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except (orjson.JSONEncodeError, TypeError):
+            pass
+    return json.dumps(data, indent=2, ensure_ascii=False, default=str).encode("utf-8")
+
 
 class ExportCollector:
     """
     Collects Pulumi stack exports and writes them once after all resolve.
 
     Features:
-    - Aggregates all exported Outputs.
+    - Aggregates all exported Outputs into a single pulumi.Output.all write.
     - Skips writing during preview (unless force=True).
-    - Atomic file write (temp file + replace).
+    - Atomic file write (temp file + replace); the final write is fsync-ed unless durable=False.
     - Optional redaction of sensitive values.
     - Optional filtering subset on finalize.
 
-    Thread-safety: export() is lock-protected.
+    Use IncrementalExportCollector to also get snapshots while outputs are still resolving.
+
+    Thread-safety: collector state is lock-protected; file writes happen outside that lock
+    and are serialized by a separate one.
     """
 
     def __init__(
@@ -80,6 +129,8 @@ class ExportCollector:
         redactor: Optional[Redactor] = None,
         skip_preview: bool = True,
         atomic: bool = True,
+        durable: Optional[bool] = None,
+        sync_dir: bool = False,
     ):
         """
         :param output_path: Path to write final exports JSON.
@@ -87,17 +138,33 @@ class ExportCollector:
                          Should accept (key, value) and return redacted value.
         :param skip_preview: Skip writing during Pulumi preview phase.
         :param atomic: Use atomic file write (temp file + replace).
+        :param durable: fsync the final write's temp file before replacing the output file
+                        (atomic mode only). Intermediate snapshots are never fsync-ed.
+                        Defaults to True unless DATAROBOT_PULUMI_EXPORTER_DURABLE=0 is set.
+        :param sync_dir: Also fsync the output directory after a durable write (POSIX only).
         """
         self._exports: Dict[str, pulumi.Output[Any]] = {}
         self._lock = Lock()
+        self._write_lock = Lock()
         self.output_path = Path(output_path)
+        # key -> (source value, redacted value); only used under the write lock
+        self._redacted_cache: Dict[str, Tuple[Any, Any]] = {}
         self.redactor = redactor
         self.skip_preview = skip_preview
         self.atomic = atomic
+        self.durable = durable if durable is not None else os.environ.get(_DURABLE_ENV_VAR, "1") != "0"
+        self.sync_dir = sync_dir
         self._finalized = False
-        # Track resolved values for incremental writing
+        self._dry_run_cached: Optional[bool] = None
         self._resolved_values: Dict[str, Any] = {}
         self._finalize_invoked = False
+        self._subset_filter: Optional[set[str]] = None
+        self._on_written: Optional[Callable[[Path], None]] = None
+        # Keeps the aggregate output alive until it resolves
+        self._aggregate_output: Optional[pulumi.Output[None]] = None
+        # Bumped whenever a resolved value changes; lets snapshots skip unchanged content
+        self._revision = 0
+        self._last_written_revision = -1
 
     def export(self, name: str, value: Any) -> pulumi.Output[Any]:
         """
@@ -108,17 +175,6 @@ class ExportCollector:
         with self._lock:
             self._exports[name] = out
         pulumi.export(name, out)
-
-        # Capture resolved values incrementally
-        def _capture(val: Any) -> Any:
-            with self._lock:
-                self._resolved_values[name] = val
-                # Write snapshot if finalize has been called and we have values
-                if self._finalize_invoked and self._resolved_values:
-                    self._write_current_values()
-            return val
-
-        out.apply(_capture)
         return out
 
     def finalize(
@@ -130,75 +186,300 @@ class ExportCollector:
         """
         Resolve all collected outputs and write them to the output_path.
         subset: only write these keys (others still exported to Pulumi).
-        force: write even during preview.
+        force: write even during preview. In a preview, unknown outputs never resolve, so only
+               the known values are written, each time one of them resolves.
         on_written: callback invoked with final path after write.
         """
         if self._finalized:
             return
-        if self.skip_preview and pulumi.runtime.is_dry_run() and not force:
+        if self.skip_preview and not force and self._dry_run:
             return
         with self._lock:
             if not self._exports:
                 return
             self._finalize_invoked = True
             self._subset_filter = set(subset) if subset else None
-            # Write any values we already have
-            if self._resolved_values:
-                self._write_current_values(on_written)
+            self._on_written = on_written
+            exports = dict(self._exports)
+        self._schedule_write(exports)
         self._finalized = True
 
+    def _schedule_write(self, exports: Dict[str, pulumi.Output[Any]]) -> None:
+        """Write all exports at once, after every one of them has resolved."""
+        if self._dry_run:
+            # Output.all never runs its callback if any export is unknown, which is common in a
+            # preview; tap each output instead so the known values still get written
+            for name, out in exports.items():
+                out.apply(_Capture(self, name))
+            return
+        self._aggregate_output = pulumi.Output.all(**exports).apply(self._write_resolved)
+
+    def _on_resolved(self, key: str, val: Any) -> None:
+        """Record a value resolved by a per-output tap and write the values known so far."""
+        with self._lock:
+            if key not in self._resolved_values or self._resolved_values[key] != val:
+                self._revision += 1
+            self._resolved_values[key] = val
+        self._flush_snapshot(self._on_written)
+
+    @property
+    def output_path(self) -> Path:
+        return self._output_path
+
+    @output_path.setter
+    def output_path(self, value: Path) -> None:
+        self._output_path = Path(value)
+        # Cached string forms used on the write path, so each write doesn't allocate new Path objects
+        self._output_path_str = str(self._output_path)
+        self._output_parent_str = str(self._output_path.parent)
+
+    @property
+    def redactor(self) -> Optional[Redactor]:
+        return self._redactor
+
+    @redactor.setter
+    def redactor(self, value: Optional[Redactor]) -> None:
+        self._redactor = value
+        self._redacted_cache.clear()
+
+    @property
+    def _dry_run(self) -> bool:
+        """Whether this is a preview; it can't change during a Pulumi run, so look it up only once."""
+        if self._dry_run_cached is None:
+            self._dry_run_cached = bool(pulumi.runtime.is_dry_run())
+        return self._dry_run_cached
+
     def _apply_redaction(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        if not self.redactor:
+        """Redact values in place; `data` is always the private copy made by _current_values."""
+        if not self._redactor:
             return data
-        return {k: self.redactor(k, v) for k, v in data.items()}
-
-    def _write_current_values(self, on_written: Optional[Callable[[Path], None]] = None) -> None:
-        """Write currently resolved values to file."""
-        data = dict(self._resolved_values)
-        if hasattr(self, "_subset_filter") and self._subset_filter is not None:
-            data = {k: v for k, v in data.items() if k in self._subset_filter}
-        if not data:
-            return
-        self._write(data, on_written)
+        # Values usually don't change between snapshots, so only redact new or replaced ones.
+        # The cache holds a reference to each source value, so the identity check can't be fooled by id reuse.
+        for k, v in data.items():
+            entry = self._redacted_cache.get(k)
+            if entry is None or entry[0] is not v:
+                entry = (v, self._redactor(k, v))
+                self._redacted_cache[k] = entry
+            data[k] = entry[1]
+        return data
+
+    def _write_resolved(self, resolved: Dict[str, Any]) -> None:
+        """Write all exports at once after every one of them has resolved."""
+        with self._lock:
+            self._resolved_values.update(resolved)
+        self._flush_snapshot(self._on_written, final=True)
+
+    def _flush_snapshot(self, on_written: Optional[Callable[[Path], None]] = None, final: bool = False) -> None:
+        """
+        Write currently resolved values to file.
+        final: this is the last write of the run; write it even if nothing changed since
+               the previous one and make it durable (see `durable`).
+
+        The state lock is only held while copying the values, so resolving outputs never waits
+        on file I/O. Writers are serialized so an older snapshot can't replace a newer one.
+        """
+        with self._write_lock:
+            with self._lock:
+                if not final and self._revision == self._last_written_revision:
+                    return
+                revision = self._revision
+                data = self._current_values()
+            if not data:
+                return
+            self._write(data, on_written, durable=final and self.durable)
+            self._last_written_revision = revision
+
+    def _current_values(self) -> Dict[str, Any]:
+        """Copy of the resolved values to write, built in a single pass."""
+        if self._subset_filter is None:
+            return dict(self._resolved_values)
+        return {k: v for k, v in self._resolved_values.items() if k in self._subset_filter}
 
     def _write(
         self,
         resolved: Dict[str, Any],
         on_written: Optional[Callable[[Path], None]],
+        durable: bool = False,
     ) -> None:
         data = self._apply_redaction(resolved)
-        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        os.makedirs(self._output_parent_str, exist_ok=True)
         if self.atomic:
             # Note, there are edge cases where this might not actually be atomic despite the `self.atomic` flag.
             # If we see issues like this in the wild, take a look at:
             #  https://python-atomicwrites.readthedocs.io/en/latest/_modules/atomicwrites.html#atomic_write
-            fd, tmp_name = tempfile.mkstemp(prefix="pulumi_exports_", suffix=".json", dir=str(self.output_path.parent))
+            fd, tmp_name = tempfile.mkstemp(prefix="pulumi_exports_", suffix=".json", dir=self._output_parent_str)
             try:
-                with os.fdopen(fd, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=4, default=str)
-                Path(tmp_name).replace(self.output_path)
+                with os.fdopen(fd, "wb") as f:
+                    f.write(_dumps(data))
+                    if durable:
+                        f.flush()
+                        os.fsync(f.fileno())
+                os.replace(tmp_name, self._output_path_str)
+                if durable and self.sync_dir:
+                    dir_fd = os.open(self._output_parent_str, os.O_RDONLY)
+                    try:
+                        os.fsync(dir_fd)
+                    finally:
+                        os.close(dir_fd)
             except Exception:
                 # Best effort cleanup; ignore secondary errors.
                 try:
-                    if Path(tmp_name).exists():
-                        Path(tmp_name).unlink()
+                    if os.path.exists(tmp_name):
+                        os.unlink(tmp_name)
                 finally:
                     raise
         else:
-            with self.output_path.open("w") as f:
-                json.dump(data, f, indent=4, default=str)
+            with open(self._output_path_str, "wb") as f:
+                f.write(_dumps(data))
         if on_written:
             on_written(self.output_path)
         return None  # Pulumi requires a return
 
 
-# Default singleton collector & functional facade
-default_collector = ExportCollector()
+class _Capture:
+    """apply() callback feeding one export's resolved value back to its collector."""
+
+    __slots__ = ("collector", "key")
+
+    def __init__(self, collector: ExportCollector, key: str):
+        self.collector = collector
+        self.key = key
+
+    def __call__(self, val: Any) -> Any:
+        self.collector._on_resolved(self.key, val)
+        return val
+
+
+class IncrementalExportCollector(ExportCollector):
+    """
+    ExportCollector that also writes snapshots while outputs are still resolving.
+
+    Every export gets its own apply() tap. After finalize() has been called, snapshots are
+    debounced: each resolution restarts a quiet period of min_write_interval_sec, and the final
+    snapshot is written as soon as nothing is pending.
+    """
+
+    def __init__(
+        self,
+        output_path: Path = Path("../pulumi_config.json"),
+        redactor: Optional[Redactor] = None,
+        skip_preview: bool = True,
+        atomic: bool = True,
+        durable: Optional[bool] = None,
+        sync_dir: bool = False,
+        min_write_interval_sec: float = 0.2,
+    ):
+        """
+        :param min_write_interval_sec: Quiet period to wait for before writing an intermediate
+                                       snapshot while some outputs are still unresolved.
+
+        See ExportCollector for the other parameters.
+        """
+        super().__init__(
+            output_path=output_path,
+            redactor=redactor,
+            skip_preview=skip_preview,
+            atomic=atomic,
+            durable=durable,
+            sync_dir=sync_dir,
+        )
+        self._min_write_interval_sec = min_write_interval_sec
+        # Number of exports whose value hasn't resolved yet
+        self._pending_count = 0
+        self._pending_timer: Optional[Timer] = None
+
+    def export(self, name: str, value: Any) -> pulumi.Output[Any]:
+        out = super().export(name, value)
+        with self._lock:
+            self._pending_count += 1
+
+        # Capture resolved values incrementally
+        out.apply(_Capture(self, name))
+        return out
+
+    def _on_resolved(self, key: str, val: Any) -> None:
+        with self._lock:
+            if key not in self._resolved_values or self._resolved_values[key] != val:
+                self._revision += 1
+            self._resolved_values[key] = val
+            self._pending_count -= 1
+            finalize_invoked = self._finalize_invoked
+        # Write snapshot if finalize has been called
+        if finalize_invoked:
+            self._maybe_write_snapshot()
+
+    def _schedule_write(self, exports: Dict[str, pulumi.Output[Any]]) -> None:
+        # Write any values we already have; the taps take care of the rest
+        with self._lock:
+            has_values = bool(self._resolved_values)
+        if has_values:
+            self._maybe_write_snapshot()
+
+    def _maybe_write_snapshot(self) -> None:
+        """
+        Schedule a snapshot write, restarting the quiet period on every call so a burst
+        of resolutions results in a single write. Writes synchronously once nothing is pending.
+        """
+        if self._maybe_finalize_if_complete():
+            return
+        with self._lock:
+            if self._pending_timer is not None:
+                self._pending_timer.cancel()
+            else:
+                # The timer thread is a daemon; don't lose the pending snapshot if the process exits
+                # during the quiet period, e.g. in a preview or a failed update where outputs stay unknown
+                atexit.register(self._flush_pending_snapshot)
+            self._pending_timer = Timer(self._min_write_interval_sec, self._flush_snapshot)
+            self._pending_timer.daemon = True
+            self._pending_timer.start()
+
+    def _maybe_finalize_if_complete(self) -> bool:
+        """Write the final snapshot if every export has resolved. Returns True if it was written."""
+        with self._lock:
+            if self._pending_count > 0:
+                return False
+            if self._pending_timer is not None:
+                self._pending_timer.cancel()
+                self._pending_timer = None
+                atexit.unregister(self._flush_pending_snapshot)
+        self._flush_snapshot(self._on_written, final=True)
+        return True
+
+    def _flush_pending_snapshot(self) -> None:
+        """Write the snapshot a pending timer would have written. Runs at interpreter exit."""
+        with self._lock:
+            timer, self._pending_timer = self._pending_timer, None
+        if timer is None:
+            return
+        timer.cancel()
+        self._flush_snapshot(self._on_written)
+
+
+# Default singleton collector & functional facade. The collector is created on first use rather than
+# at import time; `default_collector` is still available as a module attribute (see __getattr__).
+_default_collector: Optional[ExportCollector] = None
+
+
+def _get_default() -> ExportCollector:
+    global _default_collector
+    if _default_collector is None:
+        _default_collector = ExportCollector()
+    return _default_collector
+
+
+if TYPE_CHECKING:
+    default_collector: ExportCollector
+else:
+
+    def __getattr__(name: str) -> Any:
+        if name == "default_collector":
+            return _get_default()
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def export(name: str, value: Any) -> pulumi.Output[Any]:
-    return default_collector.export(name, value)
+    return _get_default().export(name, value)
 
 
 def finalize(**kwargs: Any) -> None:
-    default_collector.finalize(**kwargs)
+    _get_default().finalize(**kwargs)
@@ -13,10 +13,13 @@
 # limitations under the License.
 from __future__ import annotations
 
+import functools
+import sys
 from enum import Enum
 from typing import Any
 
 import datarobot as dr
+from pydantic import field_validator
 
 from datarobot_pulumi_utils.schema.base import Schema
 from datarobot_pulumi_utils.schema.common import ResourceBundle
@@ -38,21 +41,34 @@ class CustomAppResourceBundles(Enum):
     CPU_8XL = ResourceBundle(name="8XL", description="2 CPU | 14GB RAM", id="cpu.8xlarge")
 
 
+@functools.lru_cache(maxsize=1)
+def _fetch_custom_app_templates() -> dict[str, str]:
+    """Map of custom application template names to IDs, fetched once per process."""
+    client = dr.client.get_client()
+    # TODO: Consider using Python SDK here:
+    #   https://github.com/datarobot/public_api_client/blob/070241a9a21b5bf19ccaaa3163b59741a8c5f3d6/datarobot/models/custom_templates.py#L168-L177
+    #   https://github.com/datarobot/public_api_client/blob/070241a9a21b5bf19ccaaa3163b59741a8c5f3d6/datarobot/models/custom_templates.py#L116
+    templates = client.get("customTemplates/", params={"templateType": "customApplicationTemplate"}).json()
+    # Names are interned so lookups with the (also interned) ApplicationTemplate.name match by identity
+    return {sys.intern(template["name"]): template["id"] for template in templates["data"]}
+
+
 class ApplicationTemplate(Schema):
     name: str
 
-    @property
-    def id(self) -> str:
-        client = dr.client.get_client()
+    @field_validator("name")
+    def intern_name(cls, v: str) -> str:
+        return sys.intern(v)
 
+    @functools.cached_property
+    def id(self) -> str:
         try:
-            # TODO: Consider using Python SDK here:
-            #   https://github.com/datarobot/public_api_client/blob/070241a9a21b5bf19ccaaa3163b59741a8c5f3d6/datarobot/models/custom_templates.py#L168-L177
-            #   https://github.com/datarobot/public_api_client/blob/070241a9a21b5bf19ccaaa3163b59741a8c5f3d6/datarobot/models/custom_templates.py#L116
-            templates = client.get("customTemplates/", params={"templateType": "customApplicationTemplate"}).json()
-            template_id: str = next(template["id"] for template in templates["data"] if template["name"] == self.name)
-            return template_id
+            name_to_id = _fetch_custom_app_templates()
         except Exception as e:
+            raise ValueError(f"Could not fetch Application Templates to look up {self.name}") from e
+        try:
+            return name_to_id[self.name]
+        except KeyError as e:
             raise ValueError(f"Could not find the Application Template ID for {self.name}") from e
 
 
@@ -11,38 +11,67 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import functools
 from unittest.mock import MagicMock, patch
 
 import pytest
 from datarobot.enums import EXECUTION_ENVIRONMENT_VERSION_BUILD_STATUS
 from datarobot.errors import ClientError
 
-from datarobot_pulumi_utils.pulumi.execution_environment import resolve_execution_environment_version
+from datarobot_pulumi_utils.pulumi.execution_environment import (
+    _resolve_execution_environment_version,
+    resolve_execution_environment_version,
+)
 
 
-@pytest.fixture(autouse=True)
-def mock_pulumi():
+# The patches are started once per module; per-test fixtures only reset the mocks
+@pytest.fixture(scope="module")
+def pulumi_patch():
     with patch("datarobot_pulumi_utils.pulumi.execution_environment.pulumi") as m:
         yield m
 
 
-@pytest.fixture(autouse=True)
-def mock_dr():
+@pytest.fixture(scope="module")
+def dr_patch():
     with patch("datarobot_pulumi_utils.pulumi.execution_environment.dr") as m:
-        m.errors.ClientError = ClientError
         yield m
 
 
+@pytest.fixture(autouse=True)
+def mock_pulumi(pulumi_patch):
+    pulumi_patch.reset_mock(return_value=True, side_effect=True)
+    return pulumi_patch
+
+
+@pytest.fixture(autouse=True)
+def mock_dr(dr_patch):
+    _resolve_execution_environment_version.cache_clear()
+    dr_patch.reset_mock(return_value=True, side_effect=True)
+    dr_patch.errors.ClientError = ClientError
+    return dr_patch
+
+
+def _unset_env(monkeypatch):
+    monkeypatch.delenv("EE_VERSION_VAR", raising=False)
+
+
+def _set_env(value, monkeypatch):
+    monkeypatch.setenv("EE_VERSION_VAR", value)
+
+
 @pytest.mark.parametrize(
-    "env_value",
-    [None, "", "short", "not24hex!!!!!!!!!!!!!!!!", "ABCDEF0123456789abcdef01"],
+    "env_setter",
+    [
+        pytest.param(_unset_env, id="unset"),
+        pytest.param(functools.partial(_set_env, ""), id="empty"),
+        pytest.param(functools.partial(_set_env, "short"), id="short"),
+        pytest.param(functools.partial(_set_env, "not24hex!!!!!!!!!!!!!!!!"), id="non-hex"),
+        pytest.param(functools.partial(_set_env, "ABCDEF0123456789abcdef01"), id="uppercase"),
+    ],
 )
-def test_invalid_or_unset_env_returns_none_without_api_call(monkeypatch, mock_pulumi, mock_dr, env_value):
+def test_invalid_or_unset_env_returns_none_without_api_call(monkeypatch, mock_pulumi, mock_dr, env_setter):
     # WHEN env is unset or version id is invalid (wrong format/length/case)
-    if env_value is None:
-        monkeypatch.delenv("EE_VERSION_VAR", raising=False)
-    else:
-        monkeypatch.setenv("EE_VERSION_VAR", env_value)
+    env_setter(monkeypatch)
 
     result = resolve_execution_environment_version("ee-id", "EE_VERSION_VAR")
 
@@ -68,6 +97,21 @@ def test_valid_hex_with_quotes_stripped(monkeypatch, mock_pulumi, mock_dr):
     mock_pulumi.warn.assert_not_called()
 
 
+def test_valid_hex_with_whitespace_stripped(monkeypatch, mock_pulumi, mock_dr):
+    # WHEN env version var has a valid value padded with whitespace around the quotes
+    monkeypatch.setenv("EE_VERSION_VAR", " 'abcdef0123456789abcdef01'\n")
+    mock_version = MagicMock()
+    mock_version.id = "abcdef0123456789abcdef01"
+    mock_version.build_status = EXECUTION_ENVIRONMENT_VERSION_BUILD_STATUS.SUCCESS
+    mock_dr.ExecutionEnvironmentVersion.get.return_value = mock_version
+
+    result = resolve_execution_environment_version("ee-id", "EE_VERSION_VAR")
+
+    # THEN the stripped version id is looked up and returned
+    assert result == "abcdef0123456789abcdef01"
+    mock_dr.ExecutionEnvironmentVersion.get.assert_called_once_with("ee-id", "abcdef0123456789abcdef01")
+
+
 def test_version_found_and_success_returns_id(monkeypatch, mock_pulumi, mock_dr):
     # WHEN pinned version exists and build_status is SUCCESS
     monkeypatch.setenv("EE_VERSION_VAR", "abcdef0123456789abcdef01")
@@ -114,3 +158,25 @@ def test_version_build_not_success_returns_none(monkeypatch, mock_pulumi, mock_d
     call_msg = mock_pulumi.warn.call_args[0][0]
     assert "abcdef0123456789abcdef01" in call_msg
     assert "using latest" in call_msg
+
+
+def test_repeated_calls_are_cached_per_env_value(monkeypatch, mock_pulumi, mock_dr):
+    # WHEN the same pinned version is resolved several times
+    monkeypatch.setenv("EE_VERSION_VAR", "abcdef0123456789abcdef01")
+    mock_version = MagicMock()
+    mock_version.id = "abcdef0123456789abcdef01"
+    mock_version.build_status = EXECUTION_ENVIRONMENT_VERSION_BUILD_STATUS.SUCCESS
+    mock_dr.ExecutionEnvironmentVersion.get.return_value = mock_version
+
+    results = [resolve_execution_environment_version("ee-id", "EE_VERSION_VAR") for _ in range(3)]
+
+    # THEN the API is only called once
+    assert results == ["abcdef0123456789abcdef01"] * 3
+    mock_dr.ExecutionEnvironmentVersion.get.assert_called_once()
+
+    # WHEN the env var changes
+    monkeypatch.setenv("EE_VERSION_VAR", "0123456789abcdef01234567")
+    resolve_execution_environment_version("ee-id", "EE_VERSION_VAR")
+
+    # THEN the new value is looked up
+    assert mock_dr.ExecutionEnvironmentVersion.get.call_count == 2
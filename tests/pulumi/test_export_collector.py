@@ -1,16 +1,43 @@
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum, IntEnum
 from pathlib import Path
 import json
+import os
+import subprocess
+import sys
+import time
 from unittest.mock import patch, MagicMock
-from datarobot_pulumi_utils.pulumi import ExportCollector
+from datarobot_pulumi_utils.pulumi import ExportCollector, IncrementalExportCollector
 import pulumi
+import pytest
 
 # This is a structural test (won't actually run in a normal test runner without Pulumi engine),
 # but demonstrates invocation shape.
 
+
+# Mock Output.all to return an aggregate output that immediately applies on the resolved dict
+def create_mock_aggregate(**outputs):
+    mock_output = MagicMock()
+    mock_output.apply.side_effect = lambda func: func({k: o.value for k, o in outputs.items()})
+    return mock_output
+
+
+def _create_deferred_output_factory(deferred):
+    # Every output resolves only when the test triggers it
+    def create_mock_output(value):
+        mock_output = MagicMock()
+        mock_output.apply.side_effect = lambda func: deferred.setdefault(value, func)
+        return mock_output
+
+    return create_mock_output
+
+
 @patch('pulumi.runtime.is_dry_run')
+@patch('pulumi.Output.all')
 @patch('pulumi.Output.from_input')
 @patch('pulumi.export')
-def test_collector_basic(mock_export, mock_from_input, mock_is_dry_run, tmp_path):
+def test_collector_basic(mock_export, mock_from_input, mock_all, mock_is_dry_run, tmp_path):
     # Mock the Pulumi runtime to not be in dry run mode
     mock_is_dry_run.return_value = False
 
@@ -19,6 +46,7 @@ def test_collector_basic(mock_export, mock_from_input, mock_is_dry_run, tmp_path
     # Mock Output.from_input to return a mock output that immediately triggers apply
     def create_mock_output(value):
         mock_output = MagicMock()
+        mock_output.value = value
         mock_output.apply = MagicMock()
 
         # When apply is called, immediately call the function with the resolved value
@@ -29,6 +57,7 @@ def test_collector_basic(mock_export, mock_from_input, mock_is_dry_run, tmp_path
         return mock_output
 
     mock_from_input.side_effect = create_mock_output
+    mock_all.side_effect = create_mock_aggregate
 
     # Create the ExportCollector instance
     c = ExportCollector(output_path=output_file, skip_preview=False)
@@ -53,9 +82,10 @@ def test_collector_basic(mock_export, mock_from_input, mock_is_dry_run, tmp_path
 
 
 @patch('pulumi.runtime.is_dry_run')
+@patch('pulumi.Output.all')
 @patch('pulumi.Output.from_input')
 @patch('pulumi.export')
-def test_collector_multiple_exports(mock_export, mock_from_input, mock_is_dry_run, tmp_path):
+def test_collector_multiple_exports(mock_export, mock_from_input, mock_all, mock_is_dry_run, tmp_path):
     # Mock the Pulumi runtime to not be in dry run mode
     mock_is_dry_run.return_value = False
 
@@ -64,6 +94,7 @@ def test_collector_multiple_exports(mock_export, mock_from_input, mock_is_dry_ru
     # Mock Output.from_input to return a mock output that immediately triggers apply
     def create_mock_output(value):
         mock_output = MagicMock()
+        mock_output.value = value
         mock_output.apply = MagicMock()
 
         # When apply is called, immediately call the function with the resolved value
@@ -74,6 +105,7 @@ def test_collector_multiple_exports(mock_export, mock_from_input, mock_is_dry_ru
         return mock_output
 
     mock_from_input.side_effect = create_mock_output
+    mock_all.side_effect = create_mock_aggregate
 
     # Create the ExportCollector instance
     c = ExportCollector(output_path=output_file, skip_preview=False)
@@ -98,9 +130,10 @@ def test_collector_multiple_exports(mock_export, mock_from_input, mock_is_dry_ru
 
 
 @patch('pulumi.runtime.is_dry_run')
+@patch('pulumi.Output.all')
 @patch('pulumi.Output.from_input')
 @patch('pulumi.export')
-def test_collector_subset_filter(mock_export, mock_from_input, mock_is_dry_run, tmp_path):
+def test_collector_subset_filter(mock_export, mock_from_input, mock_all, mock_is_dry_run, tmp_path):
     # Mock the Pulumi runtime to not be in dry run mode
     mock_is_dry_run.return_value = False
 
@@ -109,6 +142,7 @@ def test_collector_subset_filter(mock_export, mock_from_input, mock_is_dry_run,
     # Mock Output.from_input to return a mock output that immediately triggers apply
     def create_mock_output(value):
         mock_output = MagicMock()
+        mock_output.value = value
         mock_output.apply = MagicMock()
 
         # When apply is called, immediately call the function with the resolved value
@@ -119,6 +153,7 @@ def test_collector_subset_filter(mock_export, mock_from_input, mock_is_dry_run,
         return mock_output
 
     mock_from_input.side_effect = create_mock_output
+    mock_all.side_effect = create_mock_aggregate
 
     # Create the ExportCollector instance
     c = ExportCollector(output_path=output_file, skip_preview=False)
@@ -140,9 +175,10 @@ def test_collector_subset_filter(mock_export, mock_from_input, mock_is_dry_run,
 
 
 @patch('pulumi.runtime.is_dry_run')
+@patch('pulumi.Output.all')
 @patch('pulumi.Output.from_input')
 @patch('pulumi.export')
-def test_collector_skip_preview(mock_export, mock_from_input, mock_is_dry_run, tmp_path):
+def test_collector_skip_preview(mock_export, mock_from_input, mock_all, mock_is_dry_run, tmp_path):
     # Mock the Pulumi runtime to be in dry run mode
     mock_is_dry_run.return_value = True
 
@@ -151,6 +187,7 @@ def test_collector_skip_preview(mock_export, mock_from_input, mock_is_dry_run, t
     # Mock Output.from_input to return a mock output
     def create_mock_output(value):
         mock_output = MagicMock()
+        mock_output.value = value
         mock_output.apply = MagicMock()
 
         def mock_apply(func):
@@ -160,6 +197,7 @@ def test_collector_skip_preview(mock_export, mock_from_input, mock_is_dry_run, t
         return mock_output
 
     mock_from_input.side_effect = create_mock_output
+    mock_all.side_effect = create_mock_aggregate
 
     # Create the ExportCollector instance with skip_preview=True (default)
     c = ExportCollector(output_path=output_file, skip_preview=True)
@@ -175,9 +213,10 @@ def test_collector_skip_preview(mock_export, mock_from_input, mock_is_dry_run, t
 
 
 @patch('pulumi.runtime.is_dry_run')
+@patch('pulumi.Output.all')
 @patch('pulumi.Output.from_input')
 @patch('pulumi.export')
-def test_collector_force_preview(mock_export, mock_from_input, mock_is_dry_run, tmp_path):
+def test_collector_force_preview(mock_export, mock_from_input, mock_all, mock_is_dry_run, tmp_path):
     # Mock the Pulumi runtime to be in dry run mode
     mock_is_dry_run.return_value = True
 
@@ -186,6 +225,7 @@ def test_collector_force_preview(mock_export, mock_from_input, mock_is_dry_run,
     # Mock Output.from_input to return a mock output
     def create_mock_output(value):
         mock_output = MagicMock()
+        mock_output.value = value
         mock_output.apply = MagicMock()
 
         def mock_apply(func):
@@ -195,6 +235,7 @@ def test_collector_force_preview(mock_export, mock_from_input, mock_is_dry_run,
         return mock_output
 
     mock_from_input.side_effect = create_mock_output
+    mock_all.side_effect = create_mock_aggregate
 
     # Create the ExportCollector instance
     c = ExportCollector(output_path=output_file, skip_preview=True)
@@ -205,6 +246,9 @@ def test_collector_force_preview(mock_export, mock_from_input, mock_is_dry_run,
     # Finalize with force=True - should write despite dry run
     c.finalize(force=True)
 
+    # Values are captured per output, since Output.all never resolves with unknowns in a preview
+    mock_all.assert_not_called()
+
     # File should exist due to force=True
     assert output_file.exists(), "Output file should be created when force=True."
     with output_file.open() as f:
@@ -213,9 +257,10 @@ def test_collector_force_preview(mock_export, mock_from_input, mock_is_dry_run,
 
 
 @patch('pulumi.runtime.is_dry_run')
+@patch('pulumi.Output.all')
 @patch('pulumi.Output.from_input')
 @patch('pulumi.export')
-def test_collector_redactor(mock_export, mock_from_input, mock_is_dry_run, tmp_path):
+def test_collector_redactor(mock_export, mock_from_input, mock_all, mock_is_dry_run, tmp_path):
     # Mock the Pulumi runtime to not be in dry run mode
     mock_is_dry_run.return_value = False
 
@@ -224,6 +269,7 @@ def test_collector_redactor(mock_export, mock_from_input, mock_is_dry_run, tmp_p
     # Mock Output.from_input to return a mock output
     def create_mock_output(value):
         mock_output = MagicMock()
+        mock_output.value = value
         mock_output.apply = MagicMock()
 
         def mock_apply(func):
@@ -233,6 +279,7 @@ def test_collector_redactor(mock_export, mock_from_input, mock_is_dry_run, tmp_p
         return mock_output
 
     mock_from_input.side_effect = create_mock_output
+    mock_all.side_effect = create_mock_aggregate
 
     # Define a redactor that masks secret values
     def redactor(key, value):
@@ -261,3 +308,404 @@ def test_collector_redactor(mock_export, mock_from_input, mock_is_dry_run, tmp_p
             "public_url": "https://example.com"
         }
         assert data == expected, f"Expected {expected}, got {data}"
+
+
+@patch('pulumi.runtime.is_dry_run')
+@patch('pulumi.Output.from_input')
+@patch('pulumi.export')
+def test_collector_debounces_until_complete(mock_export, mock_from_input, mock_is_dry_run, tmp_path):
+    # Mock the Pulumi runtime to not be in dry run mode
+    mock_is_dry_run.return_value = False
+
+    output_file = tmp_path / "test_output.json"
+    deferred = {}
+
+    # "late" resolves only when the test triggers it, everything else resolves immediately
+    def create_mock_output(value):
+        mock_output = MagicMock()
+        mock_output.apply = MagicMock()
+
+        def mock_apply(func):
+            if value == "late":
+                deferred[value] = func
+                return None
+            return func(value)
+        mock_output.apply.side_effect = mock_apply
+        return mock_output
+
+    mock_from_input.side_effect = create_mock_output
+
+    # Use a long quiet period so no intermediate snapshot fires during the test
+    c = IncrementalExportCollector(output_path=output_file, skip_preview=False, min_write_interval_sec=60)
+
+    c.export("val1", "abc")
+    c.export("val2", "late")
+    c.finalize()
+
+    # Intermediate snapshot is debounced while val2 is still pending
+    assert not output_file.exists(), "Snapshot should be debounced while exports are pending."
+
+    # Resolving the last pending export writes the final file immediately
+    deferred["late"]("late")
+    assert output_file.exists(), "Output file was not created once all exports resolved."
+    with output_file.open() as f:
+        data = json.load(f)
+        assert data == {"val1": "abc", "val2": "late"}, f"Unexpected data {data}"
+
+
+@patch('pulumi.runtime.is_dry_run')
+@patch('pulumi.Output.all')
+@patch('pulumi.Output.from_input')
+@patch('pulumi.export')
+def test_collector_single_aggregate_write(mock_export, mock_from_input, mock_all, mock_is_dry_run, tmp_path):
+    # Mock the Pulumi runtime to not be in dry run mode
+    mock_is_dry_run.return_value = False
+
+    output_file = tmp_path / "test_output.json"
+
+    # Outputs remember their value; only the aggregate output resolves
+    def create_mock_output(value):
+        mock_output = MagicMock()
+        mock_output.value = value
+        return mock_output
+
+    mock_from_input.side_effect = create_mock_output
+    mock_all.side_effect = create_mock_aggregate
+
+    c = ExportCollector(output_path=output_file, skip_preview=False)
+
+    outputs = [c.export("val1", "abc"), c.export("val2", 123)]
+
+    # No per-output taps are registered
+    assert not any(o.apply.called for o in outputs), "Per-output apply should not be registered."
+
+    c.finalize()
+
+    # All exports are aggregated into a single write
+    mock_all.assert_called_once()
+    with output_file.open() as f:
+        data = json.load(f)
+        assert data == {"val1": "abc", "val2": 123}, f"Unexpected data {data}"
+
+
+def test_dumps_with_orjson():
+    pytest.importorskip("orjson")
+    from datarobot_pulumi_utils.pulumi.export_collector import _dumps
+
+    data = {"when": datetime(2024, 1, 1, 12, 0), "name": "abc"}
+
+    # Datetimes go through default=str, like with the stdlib encoder
+    assert json.loads(_dumps(data)) == {"when": "2024-01-01 12:00:00", "name": "abc"}
+
+
+def test_dumps_with_orjson_falls_back_to_stdlib():
+    pytest.importorskip("orjson")
+    from datarobot_pulumi_utils.pulumi.export_collector import _dumps
+
+    # orjson can't encode ints above 64 bits; the stdlib encoder can
+    data = {"big": 2**70}
+    assert _dumps(data) == json.dumps(data, indent=2).encode("utf-8")
+
+
+@patch("datarobot_pulumi_utils.pulumi.export_collector.orjson", None)
+def test_dumps_without_orjson():
+    from datarobot_pulumi_utils.pulumi.export_collector import _dumps
+
+    data = {"when": datetime(2024, 1, 1, 12, 0), "big": 2**70}
+    assert _dumps(data) == json.dumps(data, indent=2, default=str).encode("utf-8")
+
+
+class _Color(Enum):
+    RED = 1
+
+
+class _Size(IntEnum):
+    SMALL = 1
+
+
+@dataclass
+class _Point:
+    x: int
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        pytest.param("abc", id="str"),
+        pytest.param("café", id="non-ascii"),
+        pytest.param(float("nan"), id="nan"),
+        pytest.param(float("inf"), id="inf"),
+        pytest.param(_Color.RED, id="enum"),
+        pytest.param(_Size.SMALL, id="int-enum"),
+        pytest.param(_Point(x=1), id="dataclass"),
+        pytest.param(datetime(2024, 1, 1, 12, 0), id="datetime"),
+        pytest.param(2**70, id="big-int"),
+        pytest.param({"nested": [1, 2.5, None, True, {"color": _Color.RED}]}, id="nested"),
+        pytest.param({}, id="empty"),
+    ],
+)
+def test_dumps_same_output_with_and_without_orjson(value):
+    pytest.importorskip("orjson")
+    from datarobot_pulumi_utils.pulumi.export_collector import _dumps
+
+    data = {"value": value, "other": 1}
+    with_orjson = _dumps(data)
+    with patch("datarobot_pulumi_utils.pulumi.export_collector.orjson", None):
+        without_orjson = _dumps(data)
+    assert with_orjson == without_orjson
+
+
+@patch('pulumi.runtime.is_dry_run')
+@patch('pulumi.Output.all')
+@patch('pulumi.Output.from_input')
+@patch('pulumi.export')
+def test_collector_force_preview_writes_known_values(mock_export, mock_from_input, mock_all, mock_is_dry_run, tmp_path):
+    # Mock the Pulumi runtime to be in dry run mode
+    mock_is_dry_run.return_value = True
+
+    output_file = tmp_path / "test_output.json"
+
+    # "unknown" never resolves, like an unknown output during preview
+    def create_mock_output(value):
+        mock_output = MagicMock()
+        mock_output.apply.side_effect = lambda func: None if value == "unknown" else func(value)
+        return mock_output
+
+    mock_from_input.side_effect = create_mock_output
+    mock_all.side_effect = create_mock_aggregate
+
+    c = ExportCollector(output_path=output_file, skip_preview=True)
+
+    c.export("val1", "abc")
+    c.export("val2", "unknown")
+
+    c.finalize(force=True)
+
+    # The known value is written even though val2 never resolves
+    with output_file.open() as f:
+        data = json.load(f)
+        assert data == {"val1": "abc"}, f"Expected {{'val1': 'abc'}}, got {data}"
+
+
+@patch('pulumi.runtime.is_dry_run')
+@patch('pulumi.Output.from_input')
+@patch('pulumi.export')
+def test_collector_debounces_burst_into_single_snapshot(mock_export, mock_from_input, mock_is_dry_run, tmp_path):
+    # Mock the Pulumi runtime to not be in dry run mode
+    mock_is_dry_run.return_value = False
+
+    output_file = tmp_path / "test_output.json"
+    deferred = {}
+    mock_from_input.side_effect = _create_deferred_output_factory(deferred)
+
+    c = IncrementalExportCollector(output_path=output_file, skip_preview=False, durable=True, min_write_interval_sec=0.05)
+
+    for i in range(4):
+        c.export(f"val{i}", f"v{i}")
+    c.finalize()
+
+    with patch.object(c, "_write", wraps=c._write) as mock_write:
+        # A burst of resolutions while val3 is still pending
+        for i in range(3):
+            deferred[f"v{i}"](f"v{i}")
+
+        # Wait for the debounced snapshot, then make sure no other one follows
+        deadline = time.monotonic() + 2
+        while not mock_write.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.2)
+
+        # The burst results in exactly one intermediate, non-durable write
+        assert mock_write.call_count == 1
+        assert mock_write.call_args.kwargs["durable"] is False
+        assert json.loads(output_file.read_text()) == {"val0": "v0", "val1": "v1", "val2": "v2"}
+
+        # Resolving the last export writes the final, durable snapshot right away
+        deferred["v3"]("v3")
+        assert mock_write.call_count == 2
+        assert mock_write.call_args.kwargs["durable"] is True
+        assert json.loads(output_file.read_text()) == {f"val{i}": f"v{i}" for i in range(4)}
+
+
+def test_default_collector_not_created_on_import():
+    # Run in a fresh interpreter, other tests may already have touched the default collector
+    code = (
+        "import datarobot_pulumi_utils.pulumi\n"
+        "from datarobot_pulumi_utils.pulumi import export_collector\n"
+        "assert export_collector._default_collector is None\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_default_collector_is_used_by_export(monkeypatch):
+    from datarobot_pulumi_utils.pulumi import export_collector
+
+    monkeypatch.setattr(export_collector, "_default_collector", None)
+
+    from datarobot_pulumi_utils import pulumi as dr_pulumi
+
+    collector = dr_pulumi.default_collector
+    assert isinstance(collector, ExportCollector)
+    assert collector is export_collector.default_collector
+    assert collector is export_collector._default_collector
+
+    with patch.object(collector, "export") as mock_collector_export:
+        dr_pulumi.export("name", "value")
+    mock_collector_export.assert_called_once_with("name", "value")
+
+
+@patch("pulumi.runtime.is_dry_run")
+@patch("pulumi.Output.from_input")
+@patch("pulumi.export")
+def test_collector_fsyncs_only_final_write(mock_export, mock_from_input, mock_is_dry_run, tmp_path):
+    mock_is_dry_run.return_value = False
+
+    output_file = tmp_path / "test_output.json"
+    deferred = {}
+    mock_from_input.side_effect = _create_deferred_output_factory(deferred)
+
+    c = IncrementalExportCollector(output_path=output_file, skip_preview=False, min_write_interval_sec=0.05)
+    assert c.durable
+
+    c.export("val1", "v1")
+    c.export("val2", "v2")
+    c.finalize()
+
+    with patch("os.fsync") as mock_fsync:
+        # Intermediate snapshot
+        deferred["v1"]("v1")
+        deadline = time.monotonic() + 2
+        while not output_file.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert json.loads(output_file.read_text()) == {"val1": "v1"}
+        mock_fsync.assert_not_called()
+
+        # Final write
+        deferred["v2"]("v2")
+        assert json.loads(output_file.read_text()) == {"val1": "v1", "val2": "v2"}
+        mock_fsync.assert_called_once()
+
+
+@patch("pulumi.runtime.is_dry_run")
+@patch("pulumi.Output.all")
+@patch("pulumi.Output.from_input")
+@patch("pulumi.export")
+@pytest.mark.parametrize(
+    "env_value, sync_dir, expected_fsyncs",
+    [
+        pytest.param(None, False, 1, id="durable"),
+        pytest.param("0", False, 0, id="disabled-by-env"),
+        pytest.param("0", True, 0, id="disabled-by-env-with-sync-dir"),
+        pytest.param(None, True, 2, id="sync-dir"),
+    ],
+)
+def test_collector_durability(
+    mock_export,
+    mock_from_input,
+    mock_all,
+    mock_is_dry_run,
+    env_value,
+    sync_dir,
+    expected_fsyncs,
+    tmp_path,
+    monkeypatch,
+):
+    mock_is_dry_run.return_value = False
+    if env_value is None:
+        monkeypatch.delenv("DATAROBOT_PULUMI_EXPORTER_DURABLE", raising=False)
+    else:
+        monkeypatch.setenv("DATAROBOT_PULUMI_EXPORTER_DURABLE", env_value)
+
+    def create_mock_output(value):
+        mock_output = MagicMock()
+        mock_output.value = value
+        mock_output.apply.side_effect = lambda func: func(value)
+        return mock_output
+
+    mock_from_input.side_effect = create_mock_output
+    mock_all.side_effect = create_mock_aggregate
+
+    output_file = tmp_path / "test_output.json"
+    c = ExportCollector(output_path=output_file, skip_preview=False, sync_dir=sync_dir)
+    c.export("val1", "abc")
+
+    with patch("os.fsync") as mock_fsync, patch("os.open", wraps=os.open) as mock_open:
+        c.finalize()
+
+    assert json.loads(output_file.read_text()) == {"val1": "abc"}
+    assert mock_fsync.call_count == expected_fsyncs
+    # The temp file is opened through os.open as well, only count opens of the directory itself
+    dir_opens = [args for args, _ in mock_open.call_args_list if args[0] == str(tmp_path)]
+    assert dir_opens == ([(str(tmp_path), os.O_RDONLY)] if expected_fsyncs == 2 else [])
+
+
+@patch("pulumi.runtime.is_dry_run")
+@patch("pulumi.Output.from_input")
+@patch("pulumi.export")
+def test_collector_redaction_cache(mock_export, mock_from_input, mock_is_dry_run, tmp_path):
+    mock_is_dry_run.return_value = False
+
+    output_file = tmp_path / "test_output.json"
+    deferred = {}
+    mock_from_input.side_effect = _create_deferred_output_factory(deferred)
+
+    redacted = []
+
+    def counting_redactor(key, value):
+        redacted.append(key)
+        return "***" if "secret" in key else value
+
+    c = IncrementalExportCollector(
+        output_path=output_file, skip_preview=False, redactor=counting_redactor, min_write_interval_sec=60
+    )
+    c.export("secret_token", "s3cr3t")
+    c.export("public_url", "https://example.com")
+    c.finalize()
+
+    # The first snapshot redacts the only resolved value
+    deferred["s3cr3t"]("s3cr3t")
+    c._flush_snapshot()
+    assert redacted == ["secret_token"]
+    assert json.loads(output_file.read_text()) == {"secret_token": "***"}
+
+    # The final snapshot only redacts the newly resolved value
+    deferred["https://example.com"]("https://example.com")
+    assert redacted == ["secret_token", "public_url"]
+    assert json.loads(output_file.read_text()) == {"secret_token": "***", "public_url": "https://example.com"}
+
+    # Rewriting unchanged values doesn't redact them again
+    c._flush_snapshot(final=True)
+    assert redacted == ["secret_token", "public_url"]
+
+    # Replacing the redactor drops the cached results
+    c.redactor = lambda key, value: "hidden"
+    assert c._redacted_cache == {}
+    c._flush_snapshot(final=True)
+    assert json.loads(output_file.read_text()) == {"secret_token": "hidden", "public_url": "hidden"}
+
+
+def test_incremental_collector_flushes_pending_snapshot_on_exit(tmp_path):
+    output_file = tmp_path / "test_output.json"
+    # Exit during the quiet period of a forced preview where one output never resolves
+    code = f"""
+from unittest.mock import MagicMock, patch
+
+from datarobot_pulumi_utils.pulumi import IncrementalExportCollector
+
+def create_mock_output(value):
+    mock_output = MagicMock()
+    mock_output.apply.side_effect = lambda func: func(value) if value == "known" else None
+    return mock_output
+
+with patch("pulumi.runtime.is_dry_run", return_value=True), patch("pulumi.export"), patch(
+    "pulumi.Output.from_input", side_effect=create_mock_output
+):
+    c = IncrementalExportCollector(output_path={str(output_file)!r}, min_write_interval_sec=60)
+    c.export("a", "known")
+    c.export("b", "unknown")
+    c.finalize(force=True)
+    assert c._pending_timer is not None
+"""
+    subprocess.run([sys.executable, "-c", code], check=True, timeout=30)
+
+    assert json.loads(output_file.read_text()) == {"a": "known"}
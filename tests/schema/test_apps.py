@@ -0,0 +1,83 @@
+# Copyright 2026 DataRobot, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from unittest.mock import patch
+
+import pytest
+
+from datarobot_pulumi_utils.schema.apps import (
+    ApplicationTemplate,
+    ApplicationTemplates,
+    _fetch_custom_app_templates,
+)
+
+TEMPLATES = {
+    "data": [
+        {"name": "Flask App Base", "id": "flask-id"},
+        {"name": "Streamlit App Base", "id": "streamlit-id"},
+        {"name": "Slack Bot App", "id": "slack-id"},
+    ]
+}
+
+
+def _clear_caches():
+    _fetch_custom_app_templates.cache_clear()
+    # The enum members are process-wide, drop their cached ids as well
+    for template in ApplicationTemplates:
+        template.value.__dict__.pop("id", None)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    _clear_caches()
+    yield
+    _clear_caches()
+
+
+@pytest.fixture
+def mock_get_client():
+    with patch("datarobot_pulumi_utils.schema.apps.dr.client.get_client") as m:
+        m.return_value.get.return_value.json.return_value = TEMPLATES
+        yield m
+
+
+def test_templates_fetched_once(mock_get_client):
+    assert ApplicationTemplates.FLASK_APP_BASE.value.id == "flask-id"
+    assert ApplicationTemplates.STREAMLIT_APP_BASE.value.id == "streamlit-id"
+    assert ApplicationTemplates.SLACK_BOT_APP.value.id == "slack-id"
+
+    mock_get_client.return_value.get.assert_called_once_with(
+        "customTemplates/", params={"templateType": "customApplicationTemplate"}
+    )
+
+
+def test_id_is_cached_on_instance(mock_get_client):
+    template = ApplicationTemplate(name="Flask App Base")
+
+    assert template.id == "flask-id"
+    _fetch_custom_app_templates.cache_clear()
+    assert template.id == "flask-id"
+
+    assert mock_get_client.return_value.get.call_count == 1
+
+
+def test_fetch_error(mock_get_client):
+    mock_get_client.return_value.get.side_effect = RuntimeError("boom")
+
+    with pytest.raises(ValueError, match="Could not fetch Application Templates to look up Flask App Base"):
+        ApplicationTemplate(name="Flask App Base").id
+
+
+def test_unknown_name(mock_get_client):
+    with pytest.raises(ValueError, match="Could not find the Application Template ID for Unknown App"):
+        ApplicationTemplate(name="Unknown App").id